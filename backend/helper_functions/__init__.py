@@ -1,7 +1,8 @@
-from .fetch_employees import fetch_employees
+from .fetch_employees import fetch_employees, invalidate_employees
 from .safe_get import safe_get
-from .parse_currency_value import parse_currency_value
-from .daxco_transformation import daxco_transformation
+from .parse_currency_value import parse_currency_value, parse_currency_series
+from .daxco_transformation import daxco_transformation, daxco_transformation_df
 from .validate_transformation import validate_transformation
 from .constants import OUTPUT_COLUMNS
-from .validation_result import ValidationResult, RowValidation, FieldValidation, ExactMatch, EmployeeMatch 
\ No newline at end of file
+from .validation_result import ValidationResult, RowValidation, FieldValidation, ExactMatch, EmployeeMatch 
+from .row_handoff import save_rows, load_rows, purge_expired_rows
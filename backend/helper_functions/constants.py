@@ -1,9 +1,10 @@
 import os
 import logging
-from dataclasses import dataclass, asdict
+import pandas as pd
+from dataclasses import dataclass
 from typing import Optional, List, Any
 
-@dataclass
+@dataclass(slots=True)
 class Output:
     employee_id: str  # Netchex Employee Code, SSN, or Clock Sequence Number
     gross_to_net_code: str  # 1 for Earnings Code, 3 for Employee Deduction Amount, 4 for Employer Deduction Amount
@@ -35,9 +36,44 @@ class Output:
     scheduled_payroll_valid: Optional[bool] = None
 
     def to_dict(self):
-        return asdict(self)
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    @classmethod
+    def from_records(cls, rows):
+        """
+        Build a columnar batch of rows (one DataFrame column per Output field) from dicts.
+
+        This replaces `[Output(**r) for r in rows]` where the rows are only read, e.g. for
+        validate_transformation: no per-row object is created. Fields missing from a row
+        are None, as with the Output defaults.
+
+        Args:
+            rows (list[dict]): Rows keyed by Output field names.
+
+        Returns:
+            pandas.DataFrame: The rows, with object-dtype columns in Output field order.
+
+        Raises:
+            TypeError: If a row has a key that is not an Output field or lacks a required
+                field (the same cases in which Output(**r) fails).
+        """
+        # Key-set checks only (C-level set operations), no per-row object construction
+        required = _REQUIRED_FIELDS
+        for idx, row in enumerate(rows):
+            if not required <= row.keys():
+                missing = sorted(required - row.keys())
+                raise TypeError(f"Output row {idx} missing required fields: {missing}")
+        df = pd.DataFrame(rows, dtype=object)
+        unknown = [col for col in df.columns if col not in cls.__slots__]
+        if unknown:
+            raise TypeError(f"Output got unexpected fields: {unknown}")
+        df = df.reindex(columns=list(cls.__slots__))
+        return df.astype(object).where(df.notna(), None)
 
 OUTPUT_COLUMNS = [
     'employee_id', 'gross_to_net_code', 'type_code', 
     'hours_or_amount', 'temporary_rate', 'distributed_dept_code'
-]
\ No newline at end of file
+]
+
+# Output fields without a default, which every row passed to Output.from_records must have
+_REQUIRED_FIELDS = frozenset(OUTPUT_COLUMNS)
@@ -1,107 +1,284 @@
 import logging
-from .safe_get import safe_get
-from .parse_currency_value import parse_currency_value
 import os
-import difflib
+import numpy as np
 import pandas as pd
 import io
-from .constants import Output
+from rapidfuzz import fuzz
 
+# pyarrow is optional; without it every file is parsed with pandas
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+from .constants import Output, OUTPUT_COLUMNS
+from .parse_currency_value import parse_currency_series
+
+# Labels expected in the first column of the Daxco report (matched against raw bytes)
+HEADER_LABEL = b'staff first name'
+DEPARTMENT_LABEL = b'department'
+
+# Report columns used by the transformation; everything else is skipped at parse time
+NEEDED_COLUMNS = [
+    'Staff First Name', 'Staff Last Name', 'Adjustments', 'Time Clock Hours',
+    'Scheduled Hours', 'Scheduled Payroll', 'Total Hours', 'Details'
+]
+TEXT_COLUMN_DTYPES = {'Staff First Name': 'string', 'Staff Last Name': 'string', 'Details': 'string'}
+
+# Files at least this large are parsed with PyArrow's multithreaded reader when it is available
+ARROW_CSV_MIN_BYTES = 256 * 1024
+
+
+def _first_column(line):
+    """
+    Return the normalized first column of a raw CSV line (lowercase, unquoted, colon removed).
+    """
+    return line.split(b',', 1)[0].strip().strip(b'"').lower().replace(b':', b'')
+
+def _matches_label(first_col, label):
+    """
+    Check whether a normalized first column matches one of the known report labels.
+
+    An exact or prefix match is tried first; the fuzzy comparison only runs when that fails,
+    to tolerate small typos in hand-edited files.
+
+    Args:
+        first_col (bytes): The normalized first column (see _first_column).
+        label (bytes): The expected label, e.g. b'department'.
+
+    Returns:
+        bool: True if the column matches the label.
+    """
+    if first_col.startswith(label):
+        return True
+    return fuzz.ratio(first_col, label) >= 70
+
+def _scan_header(file_bytes):
+    """
+    Scan the report preamble once to find both the department and the table header row.
+
+    Args:
+        file_bytes (bytes or bytearray): The raw bytes of the uploaded CSV file.
+
+    Returns:
+        tuple: (department (str or None), header_idx (int or None), header_offset (int or None))
+            - department: Value of the first 'Department:' line, or None if not present.
+            - header_idx: Line index of the last 'Staff First Name' header row, or None if not found.
+            - header_offset: Byte offset at which that header row starts, or None if not found.
+    """
+    department = None
+    header_idx = None
+    header_offset = None
+    offset = 0
+    # Work on the raw bytes; only the department line is ever decoded
+    for idx, line in enumerate(file_bytes.splitlines(keepends=True)):
+        first_col = _first_column(line)
+        if _matches_label(first_col, HEADER_LABEL):
+            # Use the latest (last) index
+            header_idx = idx
+            header_offset = offset
+        elif department is None and _matches_label(first_col, DEPARTMENT_LABEL):
+            department = line.decode('utf-8').split(',')[1].strip().strip('"').split(',')[0].strip()
+        offset += len(line)
+    return department, header_idx, header_offset
 
 def get_department_from_bytes(file_bytes):
-    file_text = file_bytes.decode('utf-8')
-    for line in file_text.splitlines():
-        first_col = line.split(',')[0].strip().strip('"')
-        # Remove colon for fuzzy match
-        if difflib.get_close_matches(first_col.lower().replace(':', ''), ['department'], n=1, cutoff=0.7):
-            return line.split(',')[1].strip().strip('"').split(',')[0].strip()
-    return None
+    return _scan_header(file_bytes)[0]
+
+def _read_report_table(file_bytes, header_idx, header_offset):
+    """
+    Parse the payroll table that starts at the header row into a DataFrame.
+
+    Large files are parsed with PyArrow's multithreaded CSV reader straight from the header
+    offset when pyarrow is installed; smaller files use pandas' C parser, where thread
+    start-up would outweigh the gain. Only NEEDED_COLUMNS are parsed either way.
+
+    Args:
+        file_bytes (bytes or bytearray): The raw bytes of the uploaded CSV file.
+        header_idx (int): Line index of the header row.
+        header_offset (int): Byte offset of the header row.
+
+    Returns:
+        pandas.DataFrame: The parsed table.
+    """
+    if pacsv is not None and len(file_bytes) >= ARROW_CSV_MIN_BYTES:
+        try:
+            table = pacsv.read_csv(
+                pa.BufferReader(pa.py_buffer(file_bytes).slice(header_offset)),
+                read_options=pacsv.ReadOptions(use_threads=True, block_size=1 << 20),
+                convert_options=pacsv.ConvertOptions(
+                    include_columns=NEEDED_COLUMNS,
+                    include_missing_columns=True,
+                    column_types={col: pa.string() for col in TEXT_COLUMN_DTYPES},
+                    strings_can_be_null=True
+                )
+            )
+            # Default type mapping, so numeric columns get the same dtypes as with pandas' parser
+            return table.to_pandas().astype(TEXT_COLUMN_DTYPES)
+        except pa.ArrowInvalid as e:
+            # Arrow requires every row to have the header's column count; short rows (e.g. a
+            # "Totals,,," footer) are padded by pandas instead, so let pandas parse the file
+            logging.warning(f"PyArrow could not parse the report, falling back to pandas: {str(e)}")
+    # Only the needed columns are parsed; missing ones are filled in by _column
+    return pd.read_csv(
+        io.BytesIO(file_bytes),
+        skiprows=header_idx,
+        usecols=lambda col: col in NEEDED_COLUMNS,
+        dtype=TEXT_COLUMN_DTYPES,
+        engine='c'
+    )
 
-def daxco_transformation(file_bytes, employees):
+def _column(df, col):
     """
-    Transform a Daxco payroll CSV file into a list of structured dictionaries using the new format.
+    Return a DataFrame column with missing values (NaN/None) replaced by an empty string.
+
+    This is the column-wise equivalent of safe_get: a column that is not present in the
+    DataFrame yields a column of empty strings.
 
     Args:
-        file_bytes (bytes): The raw bytes of the uploaded CSV file.
+        df (pandas.DataFrame): The parsed CSV data.
+        col (str): The column name to look up.
+
+    Returns:
+        pandas.Series: An object-dtype Series aligned with df.index.
+    """
+    if col not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    series = df[col].astype(object)
+    return series.where(series.notna(), '')
+
+def _title_column(df, col):
+    """
+    Title-case a text column in one vectorized pass, with missing values as empty strings.
+
+    Args:
+        df (pandas.DataFrame): The parsed CSV data (text columns read with the 'string' dtype).
+        col (str): The column name to look up.
+
+    Returns:
+        pandas.Series: The title-cased column, or a column of empty strings if it is absent.
+    """
+    if col not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    return df[col].fillna('').str.title()
+
+def _first_truthy(columns, default):
+    """
+    Column-wise equivalent of `a or b or c or default`: pick, per row, the first truthy value.
+
+    Args:
+        columns (list[pandas.Series]): Candidate columns in priority order.
+        default: Value used when none of the columns hold a truthy value.
+
+    Returns:
+        pandas.Series: An object-dtype Series with the selected values.
+    """
+    # Work on the underlying object arrays to skip pandas index alignment on every step
+    values = [series.to_numpy(dtype=object) for series in columns]
+    result = np.full(len(values[0]), default, dtype=object)
+    for arr in reversed(values):
+        result = np.where(arr.astype(bool), arr, result)
+    return pd.Series(result, index=columns[0].index, dtype=object)
+
+def daxco_transformation_df(file_bytes, employees):
+    """
+    Transform a Daxco payroll CSV file into a DataFrame using the new format.
+
+    Args:
+        file_bytes (bytes or bytearray): The raw bytes of the uploaded CSV file.
         employees (list[dict]): List of employee dictionaries with 'first_name', 'last_name', and 'employee_id'.
 
     Returns:
-        list[dict]: List of transformed payroll data rows, each as a dictionary with keys:
-            'employee_id', 'gross_to_net_code', 'type_code', 'hours_or_amount', 
-            'temporary_rate', 'distributed_dept_code'.
+        pandas.DataFrame: One row per payroll line and one column per Output field, in Output
+            field order (the new format columns followed by the original reference values).
 
     Raises:
         ValueError: If the header row cannot be found in the CSV file.
     """
     logging.info(f"Parsing CSV file bytes for Daxco transformation")
-    department = get_department_from_bytes(file_bytes)
     try:
-        # Decode bytes to string and split into lines
-        file_text = file_bytes.decode('utf-8')
-        lines = file_text.splitlines()
-        header_indices = []
-        # Find the header row index by fuzzy matching first column to 'Staff First Name'
-        for idx, line in enumerate(lines):
-            first_col = line.split(',')[0].strip().strip('"')
-            if difflib.get_close_matches(first_col.lower(), ['staff first name'], n=1, cutoff=0.7):
-                header_indices.append(idx)
-        if not header_indices:
+        # Find the department and the header row index in a single pass over the file
+        department, header_idx, header_offset = _scan_header(file_bytes)
+        if header_idx is None:
             raise ValueError("Could not find header row with 'Staff First Name'")
-        header_idx = header_indices[-1]  # Use the latest (last) index
         # Read the CSV into a DataFrame, skipping rows before the header
-        df = pd.read_csv(io.BytesIO(file_bytes), skiprows=header_idx)
+        df = _read_report_table(file_bytes, header_idx, header_offset)
         logging.info(f"Parsed CSV with shape {df.shape}")
     except Exception as e:
         logging.exception(f"Exception in parse_csv: {e}")
         raise
     logging.info(f"Transforming data with {len(df)} rows and {len(employees)} employees")
-    out = []
-    for idx, row in df.iterrows():
-        # Extract first and last name from the row
-        first = safe_get(row, 'Staff First Name')
-        last = safe_get(row, 'Staff Last Name')
-        
-        # Since fetch_employees is disabled, we won't have employee data
-        # We'll use the data directly from the CSV file instead
-        first_name = first.title() if first else ''
-        last_name = last.title() if last else ''
-        
-        # Since we don't have employee data, we'll use placeholder values
-        emp_code = ''
-        dept_code = department or ""
-        
-        # Store original values for validation and reference
-        adjustments = parse_currency_value(safe_get(row, 'Adjustments'))
-        time_clock_hours = safe_get(row, 'Time Clock Hours')
-        scheduled_hours = safe_get(row, 'Scheduled Hours')
-        scheduled_payroll = safe_get(row, 'Scheduled Payroll')
-        total_hours = safe_get(row, 'Total Hours')
-        details = safe_get(row, 'Details')
-        
-        # Transform to new format
-        output_row = Output(
-            # New format fields
-            employee_id=str(emp_code),
-            gross_to_net_code="1",  # Default to Earnings Code
-            type_code="REG",  # Default to Regular earnings
-            hours_or_amount= scheduled_payroll or scheduled_hours or time_clock_hours or 0,
-            temporary_rate="",  # Default to empty
-            distributed_dept_code=dept_code or department or "4287",  # Default to 4287 if empty
-            
-            # Keep original values for reference and validation
-            first_name=first_name,
-            last_name=last_name,
-            department=department,
-            adjustments=adjustments,
-            time_clock_hours=time_clock_hours,
-            scheduled_hours=scheduled_hours,
-            scheduled_payroll=scheduled_payroll,
-            total_hours=total_hours,
-            details=details,
-            employee_code=emp_code
-        )
-        out.append(output_row)
-        if idx < 5:  # Log first few rows for debugging
+
+    # Since fetch_employees is disabled, we won't have employee data
+    # We'll use the data directly from the CSV file instead
+    first_name = _title_column(df, 'Staff First Name')
+    last_name = _title_column(df, 'Staff Last Name')
+
+    # Since we don't have employee data, we'll use placeholder values
+    emp_code = ''
+    dept_code = department or "4287"  # Default to 4287 if empty
+
+    # Store original values for validation and reference
+    adjustments = parse_currency_series(_column(df, 'Adjustments'))
+    time_clock_hours = _column(df, 'Time Clock Hours')
+    scheduled_hours = _column(df, 'Scheduled Hours')
+    scheduled_payroll = _column(df, 'Scheduled Payroll')
+    total_hours = _column(df, 'Total Hours')
+    details = _column(df, 'Details')
+
+    # Transform to new format
+    out_df = pd.DataFrame({
+        # New format fields
+        'employee_id': str(emp_code),
+        'gross_to_net_code': "1",  # Default to Earnings Code
+        'type_code': "REG",  # Default to Regular earnings
+        'hours_or_amount': _first_truthy([scheduled_payroll, scheduled_hours, time_clock_hours], default=0),
+        'temporary_rate': "",  # Default to empty
+        'distributed_dept_code': dept_code,
+
+        # Keep original values for reference and validation
+        'first_name': first_name,
+        'last_name': last_name,
+        'department': department,
+        'adjustments': adjustments,
+        'time_clock_hours': time_clock_hours,
+        'scheduled_hours': scheduled_hours,
+        'scheduled_payroll': scheduled_payroll,
+        'total_hours': total_hours,
+        'details': details,
+        'employee_code': emp_code,
+    }, index=df.index)
+    logging.info(f"Transformed {len(out_df)} rows")
+    return out_df
+
+def daxco_transformation(file_bytes, employees, as_dict=False):
+    """
+    Transform a Daxco payroll CSV file into a list of structured rows using the new format.
+
+    This is a list-based wrapper around daxco_transformation_df.
+
+    Args:
+        file_bytes (bytes or bytearray): The raw bytes of the uploaded CSV file.
+        employees (list[dict]): List of employee dictionaries with 'first_name', 'last_name', and 'employee_id'.
+        as_dict (bool, optional): Return plain dicts with only the output columns instead of
+            Output objects. Use when the reference/validation fields are not needed.
+
+    Returns:
+        list[Output] or list[dict]: List of transformed payroll data rows. With as_dict=True each
+            row is a dictionary with keys:
+            'employee_id', 'gross_to_net_code', 'type_code', 'hours_or_amount', 
+            'temporary_rate', 'distributed_dept_code'.
+
+    Raises:
+        ValueError: If the header row cannot be found in the CSV file.
+    """
+    out_df = daxco_transformation_df(file_bytes, employees)
+    if as_dict:
+        return out_df[OUTPUT_COLUMNS].to_dict(orient='records')
+    # Columns are in Output field order, so rows can be passed positionally
+    out = [Output(*row) for row in out_df.itertuples(index=False, name=None)]
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        for idx, output_row in enumerate(out[:5]):  # Log first few rows for debugging
             logging.debug(f"Transformed row {idx}: {output_row}")
-    logging.info(f"Transformed {len(out)} rows")
-    return out
\ No newline at end of file
+    return out
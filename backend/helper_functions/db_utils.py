@@ -3,16 +3,25 @@ import platform
 import logging
 import urllib.parse
 import time
+import queue
+import threading
+import re
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
 from dotenv import load_dotenv
+from .sql_queries import HEALTH_CHECK_QUERY
 
 # Load environment variables from .env file
 load_dotenv()
 
+@lru_cache(maxsize=1)
 def get_db_config():
     """
     Get database configuration from environment variables.
+    The environment is read once per process; later calls return the same read-only mapping.
     Returns:
-        dict: A dictionary containing database connection parameters.
+        MappingProxyType: A read-only mapping containing database connection parameters.
     """
     default_driver = "ODBC Driver 17 for SQL Server"
     # if platform.machine().lower() in ['arm64', 'aarch64']:
@@ -20,7 +29,8 @@ def get_db_config():
     #     logging.info(f"ARM64 architecture detected, using {default_driver} as default driver")
     driver = os.getenv("DB_DRIVER", default_driver)
     logging.info(f"Using database driver: {driver}")
-    return {
+    # Every caller shares the cached result, so hand out a read-only view
+    return MappingProxyType({
         "server": os.getenv("DB_SERVER", "localhost"),
         "database": os.getenv("DB_NAME", "HRPremier"),
         "username": os.getenv("DB_USERNAME"),
@@ -30,11 +40,13 @@ def get_db_config():
         "query_timeout": int(os.getenv("DB_QUERY_TIMEOUT", "30")),
         "max_retries": int(os.getenv("DB_MAX_RETRIES", "3")),
         "retry_delay": int(os.getenv("DB_RETRY_DELAY", "5"))
-    }
+    })
 
+@lru_cache(maxsize=1)
 def get_connection_string():
     """
     Generate a connection string using environment variables.
+    Built once per process from the cached get_db_config().
     Returns:
         str: A formatted connection string for pyodbc.
     """
@@ -71,6 +83,20 @@ def check_db_config():
     #     return False
     return True
 
+@lru_cache(maxsize=1)
+def get_available_drivers():
+    """
+    List the installed ODBC drivers. The lookup and its log line only happen on the first call.
+
+    Returns:
+        list[str]: Names of the available ODBC drivers.
+    """
+    import pyodbc
+    
+    drivers = list(pyodbc.drivers())
+    logging.info(f"Available ODBC drivers: {drivers}")
+    return drivers
+
 def connect_with_retry(connection_string):
     """
     Attempt to connect to the database with retry logic
@@ -99,14 +125,13 @@ def connect_with_retry(connection_string):
     logging.info(f"Using driver: {config['driver']}")
     logging.debug(f"Connection string (masked): {masked_conn_string}")
     
+    # Log more information about the available drivers (only once per process)
+    get_available_drivers()
+    
     for attempt in range(1, max_retries + 1):
         try:
             logging.info(f"Database connection attempt {attempt} of {max_retries}")
             
-            # Log more information about the driver and connection
-            drivers = [x for x in pyodbc.drivers()]
-            logging.info(f"Available ODBC drivers: {drivers}")
-            
             conn = pyodbc.connect(connection_string)
             logging.info("Database connection successful")
             return conn
@@ -136,3 +161,198 @@ def connect_with_retry(connection_string):
             else:
                 logging.error(f"Failed to connect after {max_retries} attempts")
                 raise RuntimeError(f"Database connection failed after {max_retries} attempts: {error_message}")
+
+# Maximum number of idle connections kept open for reuse
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+# Also sizes the API's pipeline workers; 0 would make the pool unbounded (LifoQueue(maxsize=0))
+if DB_POOL_SIZE < 1:
+    raise ValueError(f"DB_POOL_SIZE must be at least 1, got {DB_POOL_SIZE}")
+
+# Idle connections older than this (seconds) are pinged before being handed out again, so one
+# dropped by a server-side idle timeout is replaced instead of failing a real request
+DB_POOL_PING_AFTER = float(os.getenv("DB_POOL_PING_AFTER", "30"))
+
+class PooledConnection:
+    """
+    A pooled database connection together with the cursors prepared on it.
+
+    pyodbc only re-prepares a statement when the SQL text differs from the one last executed
+    on the cursor, so one long-lived cursor is kept per query; re-executing it with a new
+    parameter reuses the prepared statement.
+    """
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursors = {}
+        self.released_at = time.monotonic()
+
+    def is_alive(self):
+        """
+        Check the connection with a trivial query (HEALTH_CHECK_QUERY).
+
+        Returns:
+            bool: True if the query succeeded.
+        """
+        try:
+            self.cursor(HEALTH_CHECK_QUERY).execute(HEALTH_CHECK_QUERY).fetchone()
+            return True
+        except Exception as e:
+            logging.info(f"Discarding stale pooled connection: {str(e)}")
+            return False
+
+    def cursor(self, query):
+        """
+        Return the cursor dedicated to `query`, creating it on first use.
+
+        Args:
+            query (str): The SQL text the cursor will execute.
+
+        Returns:
+            Cursor object.
+        """
+        cursor = self.cursors.get(query)
+        if cursor is None:
+            cursor = self.conn.cursor()
+            self.cursors[query] = cursor
+        return cursor
+
+    def close(self):
+        """
+        Close the connection (and with it its cursors), ignoring errors from a broken connection.
+        """
+        self.cursors = {}
+        try:
+            self.conn.close()
+        except Exception as e:
+            logging.debug(f"Ignoring error while closing connection: {str(e)}")
+
+# Idle connections, shared by all worker threads. A connection is only ever used by the
+# thread that checked it out, as pyodbc connections must not be used concurrently.
+_pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+# Connections opened/closed by the pool so far (guarded by _pool_stats_lock)
+_pool_stats = {"opened": 0, "closed": 0}
+_pool_stats_lock = threading.Lock()
+
+def _count(event):
+    with _pool_stats_lock:
+        _pool_stats[event] += 1
+
+def pool_stats():
+    """
+    Report the state of the connection pool without touching the database.
+
+    Returns:
+        dict: {'size': DB_POOL_SIZE, 'idle': idle connections, 'in_use': checked-out connections,
+            'opened': connections opened so far, 'closed': connections closed so far}
+    """
+    with _pool_stats_lock:
+        opened, closed = _pool_stats["opened"], _pool_stats["closed"]
+    idle = _pool.qsize()
+    return {
+        "size": DB_POOL_SIZE,
+        "idle": idle,
+        "in_use": max(opened - closed - idle, 0),
+        "opened": opened,
+        "closed": closed
+    }
+
+@contextmanager
+def pooled_connection():
+    """
+    Check a connection out of the pool for the duration of a `with` block.
+
+    An idle connection is reused when available (after a liveness ping if it has been idle
+    for DB_POOL_PING_AFTER seconds or more); otherwise a new one is opened with
+    connect_with_retry. The connection goes back to the pool when the block completes
+    normally; if the block raises, the connection is closed instead so that a broken
+    connection is never handed out again. Connections beyond DB_POOL_SIZE are closed.
+
+    Yields:
+        PooledConnection: The checked-out connection.
+
+    Raises:
+        RuntimeError: If the connection string cannot be built or the connection fails after all retries.
+    """
+    pooled = None
+    while pooled is None:
+        try:
+            pooled = _pool.get_nowait()
+        except queue.Empty:
+            break
+        if time.monotonic() - pooled.released_at >= DB_POOL_PING_AFTER and not pooled.is_alive():
+            pooled.close()
+            _count("closed")
+            pooled = None
+    if pooled is None:
+        connection_string = get_connection_string()
+        if not connection_string:
+            raise RuntimeError("Failed to generate connection string")
+        pooled = PooledConnection(connect_with_retry(connection_string))
+        _count("opened")
+    try:
+        yield pooled
+    except BaseException:
+        pooled.close()
+        _count("closed")
+        raise
+    pooled.released_at = time.monotonic()
+    try:
+        _pool.put_nowait(pooled)
+    except queue.Full:
+        pooled.close()
+        _count("closed")
+
+
+# SQLSTATE codes of timeouts (HYT00/HYT01) and of failed or lost connections (08xxx)
+DB_TIMEOUT_SQLSTATES = frozenset({"HYT00", "HYT01"})
+DB_CONNECTION_SQLSTATES = DB_TIMEOUT_SQLSTATES | {"08001", "08004", "08S01"}
+
+# Fallbacks for errors that only carry the driver message (e.g. wrapped in a RuntimeError)
+_DB_TIMEOUT_RE = re.compile(r"timeout expired|login timeout", re.IGNORECASE)
+_DB_CONNECTION_RE = re.compile(r"timeout expired|login timeout|connection failed", re.IGNORECASE)
+
+def _sqlstate(exc):
+    """
+    Return the SQLSTATE of the first pyodbc error in an exception's cause/context chain.
+
+    Args:
+        exc (BaseException): The exception raised, possibly a RuntimeError wrapping a pyodbc error.
+
+    Returns:
+        str or None: The SQLSTATE code, or None if no pyodbc error is involved.
+    """
+    try:
+        import pyodbc
+    except ImportError:
+        return None
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, pyodbc.Error) and exc.args:
+            return exc.args[0]
+        exc = exc.__cause__ or exc.__context__
+    return None
+
+def is_db_timeout(exc):
+    """
+    Check whether an exception was caused by a database (login or query) timeout.
+
+    Args:
+        exc (BaseException): The exception to classify.
+
+    Returns:
+        bool: True for a timeout, by SQLSTATE when available, else by error message.
+    """
+    return _sqlstate(exc) in DB_TIMEOUT_SQLSTATES or bool(_DB_TIMEOUT_RE.search(str(exc)))
+
+def is_db_connection_error(exc):
+    """
+    Check whether an exception was caused by an unreachable database (timeout or failed connection).
+
+    Args:
+        exc (BaseException): The exception to classify.
+
+    Returns:
+        bool: True for a transient connection error, by SQLSTATE when available, else by error message.
+    """
+    return _sqlstate(exc) in DB_CONNECTION_SQLSTATES or bool(_DB_CONNECTION_RE.search(str(exc)))
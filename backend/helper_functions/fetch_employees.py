@@ -1,5 +1,9 @@
 import logging
 import os
+import threading
+import time
+from itertools import repeat
+from .response_cache import clear_webhook_responses
 
 # Initialize pyodbc as None
 pyodbc = None
@@ -7,6 +11,8 @@ pyodbc = None
 # Import packages with error handling
 try:
     import pyodbc
+    # Let the ODBC driver manager pool connections (must be set before the first connect)
+    pyodbc.pooling = True
 except ImportError:
     logging.error("pyodbc package not installed. Please install it with pip install pyodbc")
     
@@ -19,8 +25,14 @@ except ImportError:
         return None
         
 try:
-    from .db_utils import get_db_config, get_connection_string, check_db_config, connect_with_retry
-    from .sql_queries import FETCH_EMPLOYEES_QUERY, TEST_CONNECTION_QUERY
+    from .db_utils import (
+        get_db_config, get_connection_string, check_db_config, connect_with_retry,
+        pooled_connection
+    )
+    from .sql_queries import (
+        FETCH_EMPLOYEES_QUERY, FETCH_EMPLOYEE_EARNINGS_QUERY, FETCH_EMPLOYEE_DEDUCTIONS_QUERY,
+        FETCH_EMPLOYEE_DISTRIBUTIONS_QUERY, TEST_CONNECTION_QUERY
+    )
 except ImportError as e:
     logging.error(f"Error importing required modules: {str(e)}")
     # Define placeholders if imports fail
@@ -32,9 +44,122 @@ except ImportError as e:
         return False
     def connect_with_retry(connection_string):
         return None
+    def pooled_connection():
+        raise RuntimeError("Database helpers are not available")
     FETCH_EMPLOYEES_QUERY = ""
+    FETCH_EMPLOYEE_EARNINGS_QUERY = ""
+    FETCH_EMPLOYEE_DEDUCTIONS_QUERY = ""
+    FETCH_EMPLOYEE_DISTRIBUTIONS_QUERY = ""
     TEST_CONNECTION_QUERY = ""
 
+# Number of rows pulled from the database per fetchmany() round trip
+FETCH_BATCH_SIZE = 1000
+
+# How long (in seconds) fetched employees are reused before querying the database again
+EMPLOYEE_CACHE_TTL = float(os.getenv("EMPLOYEE_CACHE_TTL", "60"))
+
+# company_id -> (fetch time, employees); shared by all worker threads
+_employee_cache = {}
+_employee_cache_lock = threading.Lock()
+
+def invalidate_employees(company_id=None):
+    """
+    Drop cached employees so that the next fetch_employees call queries the database.
+
+    Cached /webhook responses for the company are dropped too, as they were validated
+    against the invalidated employees.
+
+    Args:
+        company_id (str or int, optional): The company to invalidate. Clears every company if omitted.
+    """
+    with _employee_cache_lock:
+        if company_id is None:
+            _employee_cache.clear()
+        else:
+            _employee_cache.pop(str(company_id), None)
+    clear_webhook_responses(company_id)
+
+def _rows_to_dicts(columns, rows):
+    """
+    Convert database rows to dictionaries keyed by column name.
+
+    The mapping is done with map/zip so that no Python-level frame runs per row.
+
+    Args:
+        columns (tuple[str]): Column names from cursor.description.
+        rows (list): Rows returned by the cursor.
+
+    Returns:
+        iterator[dict]: One dictionary per row.
+    """
+    return map(dict, map(zip, repeat(columns), rows))
+
+def _fetch_dicts(pooled, query, company_id):
+    """
+    Execute a company-scoped query and stream its result set into dictionaries.
+
+    The query runs on its own long-lived cursor (see PooledConnection.cursor), so the statement
+    is prepared on the first call and only re-executed with the new parameter afterwards.
+
+    Args:
+        pooled (PooledConnection): A connection checked out with pooled_connection().
+        query (str): SQL query taking the company ID as its only parameter.
+        company_id (str or int): The unique identifier for the company.
+
+    Returns:
+        list[dict]: One dictionary per result row.
+    """
+    cursor = pooled.cursor(query)
+    cursor.arraysize = FETCH_BATCH_SIZE
+    cursor.execute(query, [company_id])
+    columns = tuple(column[0] for column in cursor.description)
+    # Stream the result set in batches instead of materializing it with fetchall()
+    result = []
+    while True:
+        rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+        if not rows:
+            break
+        result.extend(_rows_to_dicts(columns, rows))
+    return result
+
+def _merge_employee_details(employees, earnings, deductions, distributions):
+    """
+    Attach the per-employee detail rows to the employee records in a single pass each.
+
+    Each employee gets:
+        - 'earnings': list of {'gross_to_net_code', 'type_code', 'temporary_rate'} dicts
+        - 'deductions': list of {'gross_to_net_code', 'type_code'} dicts
+        - 'dept_codes': the home department followed by any other active distribution departments
+
+    Args:
+        employees (list[dict]): One dictionary per employee (FETCH_EMPLOYEES_QUERY rows).
+        earnings (list[dict]): FETCH_EMPLOYEE_EARNINGS_QUERY rows.
+        deductions (list[dict]): FETCH_EMPLOYEE_DEDUCTIONS_QUERY rows.
+        distributions (list[dict]): FETCH_EMPLOYEE_DISTRIBUTIONS_QUERY rows.
+
+    Returns:
+        list[dict]: The employee dictionaries, updated in place.
+    """
+    by_id = {}
+    for emp in employees:
+        emp['earnings'] = []
+        emp['deductions'] = []
+        emp['dept_codes'] = [emp['home_dept_code']] if emp.get('home_dept_code') else []
+        by_id[emp['employee_id']] = emp
+    for row in earnings:
+        emp = by_id.get(row.pop('employee_id'))
+        if emp is not None:
+            emp['earnings'].append(row)
+    for row in deductions:
+        emp = by_id.get(row.pop('employee_id'))
+        if emp is not None:
+            emp['deductions'].append(row)
+    for row in distributions:
+        emp = by_id.get(row['employee_id'])
+        if emp is not None and row['distributed_dept_code'] and row['distributed_dept_code'] not in emp['dept_codes']:
+            emp['dept_codes'].append(row['distributed_dept_code'])
+    return employees
+
 def test_connection(company_id):
     """
     Tests connection to the HRPremier SQL Server database using a simple query.
@@ -58,18 +183,15 @@ def test_connection(company_id):
         # Use new db_utils helpers
         if not check_db_config():
             raise RuntimeError("Database connection parameters not fully configured")
-        connection_string = get_connection_string()
-        if not connection_string:
-            raise RuntimeError("Failed to generate connection string")
         logging.info(f"Testing connection to database using connection string (password masked)")
-        # Use the new retry logic for connection
-        with connect_with_retry(connection_string) as conn:
-            with conn.cursor() as cursor:
+        # Borrow a pooled connection (opened with retry logic when none is idle)
+        with pooled_connection() as pooled:
+            with pooled.conn.cursor() as cursor:
                 cursor.execute(TEST_CONNECTION_QUERY, [company_id])
-                columns = [column[0] for column in cursor.description]
-                employees = [dict(zip(columns, row)) for row in cursor.fetchmany(5)]
-                logging.info(f"Connection test successful. Retrieved {len(employees)} employee records for company_id={company_id}")
-                return employees
+                columns = tuple(column[0] for column in cursor.description)
+                employees = list(_rows_to_dicts(columns, cursor.fetchmany(5)))
+        logging.info(f"Connection test successful. Retrieved {len(employees)} employee records for company_id={company_id}")
+        return employees
     except pyodbc.Error as e:
         error_msg = f"Database error occurred during connection test: {str(e)}"
         logging.error(error_msg)
@@ -91,14 +213,25 @@ def fetch_employees(company_id):
         environment (str, optional): Environment setting (used to determine which DB config to use)
         
     Returns:
-        list[dict]: A list of employee dictionaries with their earnings and deductions
+        list[dict]: One dictionary per employee with their IDs, name, 'dept_codes',
+            'earnings' and 'deductions'
         
     Notes:
         This function uses a connection to the SQL Server database.
         Make sure the database connection parameters are properly set in the environment variables.
+        Results are cached per company for EMPLOYEE_CACHE_TTL seconds; the returned list is
+        shared with later callers and must not be modified. Use invalidate_employees() after
+        employee data changes.
     """
     logging.info(f"fetch_employees called with company_id={company_id}")
     
+    cache_key = str(company_id)
+    with _employee_cache_lock:
+        cached = _employee_cache.get(cache_key)
+    if cached is not None and time.monotonic() - cached[0] < EMPLOYEE_CACHE_TTL:
+        logging.info(f"Using cached employees for company_id={company_id} ({len(cached[1])} records)")
+        return cached[1]
+    
     # Check if required packages are available
     if pyodbc is None:
         error_msg = "Cannot fetch employees: pyodbc package is not installed"
@@ -110,53 +243,64 @@ def fetch_employees(company_id):
         connection_string = get_connection_string()
         if not connection_string:
             raise RuntimeError("Failed to generate connection string")
-        masked_connection = connection_string.replace(os.getenv('DB_PASSWORD', ''), '********')
-        logging.debug(f"Connection string: {masked_connection}")
-        logging.debug(f"Attempting to connect to database with driver: {get_db_config().get('driver')}")
+        debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            masked_connection = connection_string.replace(os.getenv('DB_PASSWORD', ''), '********')
+            logging.debug(f"Connection string: {masked_connection}")
+            logging.debug(f"Attempting to connect to database with driver: {get_db_config().get('driver')}")
         
-        # Use the new retry logic for connection
-        with connect_with_retry(connection_string) as conn:
-            with conn.cursor() as cursor:
-                logging.debug(f"Executing SQL query: {FETCH_EMPLOYEES_QUERY} with parameter: {company_id}")
-                # Set query timeout through the execute method instead of cursor.timeout
-                cursor.execute(FETCH_EMPLOYEES_QUERY, [company_id])
-                columns = [column[0] for column in cursor.description]
-                logging.debug(f"Retrieved columns: {columns}")
-                employees = [dict(zip(columns, row)) for row in cursor.fetchall()]
-                # if employees:
-                #     logging.info("=== Retrieved Employee Data ===")
-                #     logging.info(f"Total employees found: {len(employees)}")
-                #     logging.info("Column names from database:")
-                #     logging.info(f"{', '.join(columns)}")
-                #     logging.info("\nFirst 5 employees:")
-                #     for idx, emp in enumerate(employees[:5]):
-                #         logging.info(f"\nEmployee {idx + 1}:")
-                #         for key, value in emp.items():
-                #             logging.info(f"{key}: {value}")
-                    
-                    # Check for duplicate names
-                #     name_count = {}
-                #     for emp in employees:
-                #         full_name = f"{emp.get('first_name', '')} {emp.get('last_name', '')}"
-                #         name_count[full_name] = name_count.get(full_name, 0) + 1
+        if debug_enabled:
+            logging.debug(f"Executing employee queries with parameter: {company_id}")
+        # Borrow a pooled connection (opened with retry logic when none is idle); its cursors
+        # are kept per query, so each statement is prepared once and re-executed afterwards
+        with pooled_connection() as pooled:
+            # One query per detail table, merged per employee below (avoids a joined Cartesian product)
+            employees = _fetch_dicts(pooled, FETCH_EMPLOYEES_QUERY, company_id)
+            earnings = _fetch_dicts(pooled, FETCH_EMPLOYEE_EARNINGS_QUERY, company_id)
+            deductions = _fetch_dicts(pooled, FETCH_EMPLOYEE_DEDUCTIONS_QUERY, company_id)
+            distributions = _fetch_dicts(pooled, FETCH_EMPLOYEE_DISTRIBUTIONS_QUERY, company_id)
+            # End the read transaction before the connection goes back to the pool
+            pooled.conn.commit()
+        if debug_enabled:
+            logging.debug(f"Retrieved {len(employees)} employees, {len(earnings)} earnings, "
+                          f"{len(deductions)} deductions and {len(distributions)} distributions")
+        _merge_employee_details(employees, earnings, deductions, distributions)
+        with _employee_cache_lock:
+            _employee_cache[cache_key] = (time.monotonic(), employees)
+        # if employees:
+        #     logging.info("=== Retrieved Employee Data ===")
+        #     logging.info(f"Total employees found: {len(employees)}")
+        #     logging.info("Column names from database:")
+        #     logging.info(f"{', '.join(columns)}")
+        #     logging.info("\nFirst 5 employees:")
+        #     for idx, emp in enumerate(employees[:5]):
+        #         logging.info(f"\nEmployee {idx + 1}:")
+        #         for key, value in emp.items():
+        #             logging.info(f"{key}: {value}")
+            
+            # Check for duplicate names
+        #     name_count = {}
+        #     for emp in employees:
+        #         full_name = f"{emp.get('first_name', '')} {emp.get('last_name', '')}"
+        #         name_count[full_name] = name_count.get(full_name, 0) + 1
+            
+        #     duplicates = {name: count for name, count in name_count.items() if count > 1}
+        #     if duplicates:
+        #         logging.info("\n=== Duplicate Names Found ===")
+        #         for name, count in duplicates.items():
+        #             logging.info(f"{name}: {count} occurrences")
+        #             # Print details of employees with duplicate names
+        #             logging.info("Details of employees with this name:")
                     
-                #     duplicates = {name: count for name, count in name_count.items() if count > 1}
-                #     if duplicates:
-                #         logging.info("\n=== Duplicate Names Found ===")
-                #         for name, count in duplicates.items():
-                #             logging.info(f"{name}: {count} occurrences")
-                #             # Print details of employees with duplicate names
-                #             logging.info("Details of employees with this name:")
-                            
-                #             for emp in employees:
-                #                 if f"{emp.get('first_name', '')} {emp.get('last_name', '')}" == name:
-                #                     logging.info(f"Employee ID: {emp.get('employee_id', 'N/A')}, "
-                #                                f"First Name: {emp.get('first_name', 'N/A')}, "
-                #                                f"Last Name: {emp.get('last_name', 'N/A')}")
-                # else:
-                #     logging.warning(f"No employee records found for company_id={company_id}")
-                # logging.info(f"Successfully fetched {len(employees)} employee records for company_id={company_id}")
-                # return employees
+        #             for emp in employees:
+        #                 if f"{emp.get('first_name', '')} {emp.get('last_name', '')}" == name:
+        #                     logging.info(f"Employee ID: {emp.get('employee_id', 'N/A')}, "
+        #                                f"First Name: {emp.get('first_name', 'N/A')}, "
+        #                                f"Last Name: {emp.get('last_name', 'N/A')}")
+        # else:
+        #     logging.warning(f"No employee records found for company_id={company_id}")
+        # logging.info(f"Successfully fetched {len(employees)} employee records for company_id={company_id}")
+        # return employees
         return employees
     except pyodbc.Error as e:
         error_msg = f"Database error occurred: {str(e)}"
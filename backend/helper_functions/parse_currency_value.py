@@ -1,3 +1,9 @@
+import re
+import pandas as pd
+
+# Characters stripped from currency strings before conversion
+_CURRENCY_RE = re.compile(r'[$,]')
+
 def parse_currency_value(val):
     """
     Convert a currency string to a float value.
@@ -12,10 +18,34 @@ def parse_currency_value(val):
         >>> parse_currency_value("$1,234.56")
         1234.56
     """
+    # Values already parsed as numbers (e.g. by pandas) need no string cleanup
+    if isinstance(val, (int, float)) and not isinstance(val, bool):
+        return float(val)
     try:
-        # Remove dollar sign, commas, and whitespace
-        s = str(val).replace('$', '').replace(',', '').strip()
+        # Remove dollar sign, commas, and whitespace in one pass
+        s = _CURRENCY_RE.sub('', val if isinstance(val, str) else str(val)).strip()
         return float(s) if s else 0.0
     except Exception:
         # Return 0.0 if conversion fails
-        return 0.0 
\ No newline at end of file
+        return 0.0
+
+def parse_currency_series(series):
+    """
+    Convert a column of currency strings to float values in a single vectorized pass.
+
+    This is the column-wise equivalent of parse_currency_value and should be preferred
+    when a whole DataFrame column needs to be parsed.
+
+    Args:
+        series (pandas.Series): The values to parse (e.g., "$1,234.56", "0", "").
+
+    Returns:
+        pandas.Series: Float values. Empty, missing or unparseable entries become 0.0.
+
+    Example:
+        >>> parse_currency_series(pd.Series(["$1,234.56", "", "abc"])).tolist()
+        [1234.56, 0.0, 0.0]
+    """
+    # Remove dollar signs and commas, then surrounding whitespace
+    cleaned = series.astype(str).str.replace(_CURRENCY_RE, '', regex=True).str.strip()
+    return pd.to_numeric(cleaned, errors='coerce').fillna(0.0).astype(float)
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Encoded /webhook responses for recently processed uploads. Entries expire with the employee
+# cache (the validation depends on employee data), so a repeat upload never returns results
+# older than a fresh pipeline run could; invalidate_employees also clears them.
+WEBHOOK_CACHE_SIZE = int(os.getenv("WEBHOOK_CACHE_SIZE", "256"))
+WEBHOOK_CACHE_TTL = float(os.getenv("WEBHOOK_CACHE_TTL", os.getenv("EMPLOYEE_CACHE_TTL", "60")))
+# Total size of the cached bodies; a single /webhook body can be tens of MB
+WEBHOOK_CACHE_MAX_BYTES = int(os.getenv("WEBHOOK_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# (file digest, company_id, integration_type, integration_provider, handoff) -> (stored at, body).
+# Guarded by a lock, as invalidate_employees may run on any thread.
+_webhook_cache = OrderedDict()
+_webhook_cache_bytes = 0  # total len() of the cached bodies
+_webhook_cache_lock = threading.Lock()
+
+
+def _drop(key):
+    # Caller holds _webhook_cache_lock
+    global _webhook_cache_bytes
+    _webhook_cache_bytes -= len(_webhook_cache.pop(key)[-1])
+
+
+def webhook_cache_key(contents, company_id, integration_type, integration_provider, handoff=False):
+    """
+    Build the cache key of a /webhook request.
+
+    Args:
+        contents (bytes or bytearray): The uploaded file.
+        company_id (int): The company the file was uploaded for.
+        integration_type (str): The integration type.
+        integration_provider (str): The integration provider.
+        handoff (bool, optional): Whether the response includes a row handoff token.
+
+    Returns:
+        tuple: (file digest, company_id, integration_type, integration_provider, handoff)
+    """
+    return (hashlib.blake2b(contents, digest_size=16).digest(), company_id, integration_type, integration_provider, handoff)
+
+
+def get_cached_webhook_response(key):
+    """
+    Look up a fresh cached /webhook response, marking it as recently used.
+
+    Args:
+        key (tuple): The cache key (see webhook_cache_key).
+
+    Returns:
+        bytes or None: The encoded body, or None if there is no fresh entry.
+    """
+    with _webhook_cache_lock:
+        entry = _webhook_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= WEBHOOK_CACHE_TTL:
+            _drop(key)
+            return None
+        _webhook_cache.move_to_end(key)
+        return entry[1]
+
+
+def cache_webhook_response(key, body):
+    """
+    Store an encoded /webhook response.
+
+    Expired entries are dropped first, then the least recently used entries until the cache
+    holds at most WEBHOOK_CACHE_SIZE entries and WEBHOOK_CACHE_MAX_BYTES of bodies. A body
+    larger than the whole byte budget is not cached.
+    """
+    global _webhook_cache_bytes
+    if len(body) > WEBHOOK_CACHE_MAX_BYTES:
+        return
+    with _webhook_cache_lock:
+        now = time.monotonic()
+        # Hits move entries to the end, so expired ones can sit anywhere; the scan is bounded by WEBHOOK_CACHE_SIZE
+        for expired in [k for k, entry in _webhook_cache.items() if now - entry[0] >= WEBHOOK_CACHE_TTL]:
+            _drop(expired)
+        if key in _webhook_cache:
+            _drop(key)
+        _webhook_cache[key] = (now, body)
+        _webhook_cache_bytes += len(body)
+        while len(_webhook_cache) > WEBHOOK_CACHE_SIZE or _webhook_cache_bytes > WEBHOOK_CACHE_MAX_BYTES:
+            _drop(next(iter(_webhook_cache)))
+
+
+def clear_webhook_responses(company_id=None):
+    """
+    Drop cached /webhook responses, e.g. because the employee data they were validated against changed.
+
+    Args:
+        company_id (str or int, optional): The company whose responses to drop. Clears every company if omitted.
+    """
+    global _webhook_cache_bytes
+    with _webhook_cache_lock:
+        if company_id is None:
+            _webhook_cache.clear()
+            _webhook_cache_bytes = 0
+            return
+        for key in [key for key in _webhook_cache if str(key[1]) == str(company_id)]:
+            _drop(key)
@@ -0,0 +1,201 @@
+import logging
+import os
+import re
+import secrets
+import stat
+import tempfile
+import time
+import pandas as pd
+
+# pyarrow is optional; without it no handoff tokens are issued and clients send the rows
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+# Directory holding the handed-off row batches (payroll data, so it must be private to the app's
+# user; see _ensure_private_dir), and how long (seconds) a batch stays available
+HANDOFF_DIR = os.getenv(
+    "HANDOFF_DIR",
+    os.path.join(tempfile.gettempdir(), f"daxco_handoff-{os.getuid() if hasattr(os, 'getuid') else 'user'}")
+)
+HANDOFF_TTL = float(os.getenv("HANDOFF_TTL", "3600"))
+
+# Tokens are secrets.token_urlsafe(16); anything else is rejected before touching the filesystem
+_TOKEN_RE = re.compile(r"[A-Za-z0-9_-]{22}")
+
+
+def _handoff_path(token):
+    return os.path.join(HANDOFF_DIR, f"{token}.arrow")
+
+
+def _owner_metadata(company_id, integration_type, integration_provider):
+    """
+    Schema metadata binding a batch to the upload it came from (see save_rows/load_rows).
+    """
+    return {
+        b'daxco.company_id': str(company_id).encode('utf-8'),
+        b'daxco.integration': f"{integration_type}/{integration_provider}".encode('utf-8'),
+    }
+
+
+def _ensure_private_dir(create=False):
+    """
+    Check that HANDOFF_DIR is a real directory owned by this process' user and closed to
+    everyone else (mode 0o700), creating it that way if asked.
+
+    A directory another local user created first (or a symlink planted in its place) is
+    refused, so batches are never written where others can read them, and files others
+    could have planted are never loaded.
+
+    Args:
+        create (bool, optional): Create the directory (mode 0o700) if it does not exist.
+
+    Returns:
+        bool: True if the directory exists and is private.
+    """
+    if create:
+        try:
+            os.mkdir(HANDOFF_DIR, 0o700)
+        except FileExistsError:
+            pass
+        except OSError as e:
+            logging.warning(f"Could not create handoff directory {HANDOFF_DIR}: {str(e)}")
+            return False
+    try:
+        info = os.lstat(HANDOFF_DIR)
+    except FileNotFoundError:
+        return False
+    if not stat.S_ISDIR(info.st_mode) or stat.S_IMODE(info.st_mode) & 0o077:
+        logging.error(f"Refusing to use handoff directory {HANDOFF_DIR}: not a private directory")
+        return False
+    if hasattr(os, 'getuid') and info.st_uid != os.getuid():
+        logging.error(f"Refusing to use handoff directory {HANDOFF_DIR}: owned by another user")
+        return False
+    return True
+
+
+def _to_arrow_table(df):
+    """
+    Convert transformed rows to an Arrow table.
+
+    Object columns may mix strings and numbers (e.g. hours_or_amount defaults to 0), which Arrow
+    cannot store in one column; their non-missing values are stored as strings. Validation parses
+    these values from strings anyway, so the results are the same.
+
+    Args:
+        df (pandas.DataFrame): The transformed rows (see daxco_transformation_df).
+
+    Returns:
+        pyarrow.Table: The rows as an Arrow table.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object:
+            series = series.where(series.isna(), series.astype(str))
+        columns[col] = series
+    return pa.Table.from_pandas(pd.DataFrame(columns, index=df.index), preserve_index=False)
+
+
+def purge_expired_rows(now=None):
+    """
+    Delete handed-off row batches older than HANDOFF_TTL (run periodically by the API and on
+    loading an expired token).
+
+    Args:
+        now (float, optional): Current time (time.time()); defaults to now.
+    """
+    now = time.time() if now is None else now
+    if not _ensure_private_dir():
+        return
+    try:
+        entries = list(os.scandir(HANDOFF_DIR))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            if now - entry.stat().st_mtime >= HANDOFF_TTL:
+                os.remove(entry.path)
+        except OSError as e:
+            logging.debug(f"Ignoring error while purging {entry.path}: {str(e)}")
+
+
+def save_rows(df, company_id, integration_type, integration_provider):
+    """
+    Store transformed rows as an uncompressed Arrow IPC (Feather) file for a later /validate call.
+
+    The company and integration of the upload are stored in the schema metadata, so that the
+    rows can only be loaded back for the same company and integration.
+
+    Args:
+        df (pandas.DataFrame): The transformed rows (one column per Output field).
+        company_id (int): The company the rows were uploaded for.
+        integration_type (str): The integration type of the upload.
+        integration_provider (str): The integration provider of the upload.
+
+    Returns:
+        str or None: The token identifying the rows, or None if pyarrow is not installed or the
+            rows could not be stored (the client then sends the rows as before).
+    """
+    if feather is None:
+        return None
+    if not _ensure_private_dir(create=True):
+        return None
+    try:
+        token = secrets.token_urlsafe(16)
+        # Readable by this user only; O_EXCL never follows or reuses an existing file
+        fd = os.open(_handoff_path(token), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            # Uncompressed, so that load_rows can memory-map the columns instead of decompressing them
+            table = _to_arrow_table(df)
+            table = table.replace_schema_metadata({
+                **(table.schema.metadata or {}),
+                **_owner_metadata(company_id, integration_type, integration_provider)
+            })
+            feather.write_feather(table, f, compression='uncompressed')
+        logging.info(f"Stored {len(df)} rows for handoff")
+        return token
+    except Exception as e:
+        logging.warning(f"Could not store rows for handoff: {str(e)}")
+        return None
+
+
+def load_rows(token, company_id, integration_type, integration_provider):
+    """
+    Load rows stored by save_rows for the same company and integration.
+
+    Args:
+        token (str): The token returned by save_rows.
+        company_id (int): The company the rows are validated for.
+        integration_type (str): The integration type of the request.
+        integration_provider (str): The integration provider of the request.
+
+    Returns:
+        pandas.DataFrame or None: The rows (missing values as None), or None if the token is
+            unknown, malformed or expired, belongs to another company or integration, or
+            pyarrow is not installed.
+    """
+    if feather is None or not isinstance(token, str) or not _TOKEN_RE.fullmatch(token):
+        return None
+    if not _ensure_private_dir():
+        return None
+    path = _handoff_path(token)
+    try:
+        if time.time() - os.path.getmtime(path) >= HANDOFF_TTL:
+            # Expired; sweep this and any other stale batches now rather than at the next timer
+            purge_expired_rows()
+            return None
+        table = feather.read_table(path, memory_map=True)
+    except (FileNotFoundError, OSError) as e:
+        logging.warning(f"Handoff rows not available for token: {str(e)}")
+        return None
+    metadata = table.schema.metadata or {}
+    for key, value in _owner_metadata(company_id, integration_type, integration_provider).items():
+        if metadata.get(key) != value:
+            logging.warning("Handoff token rejected: stored for another company or integration")
+            return None
+    df = table.to_pandas().astype(object)
+    return df.where(df.notna(), None)
@@ -1,5 +1,15 @@
 import pandas as pd
 
+def _blank_if_missing(val):
+    """
+    Return an empty string if a scalar value is missing (None, NaN, pd.NA or NaT), else the value.
+
+    This avoids the generic pd.isna dispatch, which is comparatively slow when called once per cell.
+    """
+    if val is None or val is pd.NA or val is pd.NaT or (isinstance(val, float) and val != val):
+        return ''
+    return val
+
 def safe_get(row, col):
     """
     Safely retrieve a value from a pandas Series or dictionary, returning an empty string if the value is missing or NaN.
@@ -16,4 +26,4 @@ def safe_get(row, col):
         ''
     """
     val = row.get(col, '')  # Get the value for the column, default to '' if not found
-    return '' if pd.isna(val) else val  # Return '' if value is NaN, else return the value 
\ No newline at end of file
+    return _blank_if_missing(val)  # Return '' if value is NaN, else return the value
@@ -1,9 +1,51 @@
 import logging
+import sys
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
 from .constants import Output
 from .validation_result import ValidationResult, RowValidation, FieldValidation, ExactMatch, EmployeeMatch
 import json
 
-def validate_employee_id(row, employees):
+# Translation table removing currency symbols and thousands separators in a single pass
+_CURRENCY_STRIP = str.maketrans('', '', '$,')
+
+@dataclass
+class EmployeeIndex:
+    """
+    Lookup tables over the employee list, built once per validation run.
+
+    Employee IDs and names are normalized once here so that per-row checks are
+    single dictionary lookups instead of scans over all employees. The
+    normalized names are interned, so employees sharing a name share one string.
+    """
+    by_id: Dict[str, dict] = field(default_factory=dict)  # stripped employee_id -> first matching employee
+    by_name: Dict[Tuple[str, str], List[Any]] = field(default_factory=dict)  # (first, last) lowercased -> employee IDs
+
+    @classmethod
+    def from_employees(cls, employees):
+        """
+        Build the index from a list of employee dictionaries.
+
+        Args:
+            employees (list[dict]): List of employee dictionaries.
+
+        Returns:
+            EmployeeIndex: The populated index. Name matches keep the employees list order.
+        """
+        index = cls()
+        for emp in employees:
+            index.by_id.setdefault(str(emp.get('employee_id', '')).strip(), emp)
+            key = (
+                sys.intern(str(emp.get('first_name', '')).lower().strip()),
+                sys.intern(str(emp.get('last_name', '')).lower().strip())
+            )
+            index.by_name.setdefault(key, []).append(emp.get('employee_id', ''))
+        return index
+
+
+def validate_employee_id(row, employees, index=None):
     """
     Validate the employee ID in a row against a list of employees.
     
@@ -13,6 +55,7 @@ def validate_employee_id(row, employees):
     Args:
         row (dict): The data row containing 'first_name', 'last_name', and 'employee_id'.
         employees (list[dict]): List of employee dictionaries.
+        index (EmployeeIndex, optional): Lookup index over employees. Built on the fly if omitted.
 
     Returns:
         tuple: (employee_id_valid (bool), possible_ids (list))
@@ -24,46 +67,25 @@ def validate_employee_id(row, employees):
         logging.warning("No employees available for validation - skipping employee ID validation")
         return True, []
     
-    # Log the validation attempt
-    #print(f"Validating employee file: {row}")
-    #print(f"Validating employee DB: {employees}")
-    print(f"Validating employee: {row}")
-    first_name = row.get('first_name', '')
-    last_name = row.get('last_name', '')
-    employee_id = row.get('employee_id', '')
-    
-    #logging.info(f"Validating employee: ID={employee_id}, name={first_name} {last_name}")
+    if index is None:
+        index = EmployeeIndex.from_employees(employees)
     
-    # Check if the employee_id exists in the employees list
+    # An exact ID match needs no name lookup
+    employee_id = row.get('employee_id', '')
     if employee_id:
-        # Try to find the employee by ID
-        exact_match = next((emp for emp in employees if str(emp.get('employee_id', '')).strip() == str(employee_id).strip()), None)
+        exact_match = index.by_id.get(str(employee_id).strip())
         if exact_match:
             logging.info(f"Found exact match for employee_id={employee_id}: {exact_match.get('first_name', '')} {exact_match.get('last_name', '')}")
             return True, []
     
-    # If we have name data, try to find possible matches based on name
-    possible_matches = []
-    print(f"Checking for possible matches for employee: {first_name} {last_name}")
-    if first_name or last_name:
-        for emp in employees:
-            emp_first = str(emp.get('first_name', '')).lower().strip()
-            emp_last = str(emp.get('last_name', '')).lower().strip()
-            
-            row_first = first_name.lower().strip() if first_name else ''
-            row_last = last_name.lower().strip() if last_name else ''
-            print(f"Comparing: {row_first} {row_last} with {emp_first} {emp_last}")
-            # Check for name similarity
-            if (row_first and row_first == emp_first) and (row_last and row_last == emp_last):
-                possible_matches.append(emp.get('employee_id', ''))
-    
-    # Check if we found any possible matches
-    if possible_matches:
-        #logging.info(f"Found {len(possible_matches)} possible employee matches: {possible_matches}")
-        return False, possible_matches
-    
-    #logging.warning(f"No match found for employee: ID={employee_id}, name={first_name} {last_name}")
-    return False, []
+    # Possible matches by name need both a first and a last name
+    name_key = (
+        (row.get('first_name', '') or '').lower().strip(),
+        (row.get('last_name', '') or '').lower().strip()
+    )
+    if not all(name_key):
+        return False, []
+    return False, list(index.by_name.get(name_key, []))
 
 
 def validate_hours_or_amount(row, idx=None):
@@ -83,9 +105,13 @@ def validate_hours_or_amount(row, idx=None):
     hours_or_amount_val = 0.0
     hours_or_amount_valid = True
     try:
-        # Remove currency symbols and commas, then convert to float
-        hours_or_amount_str = str(hours_or_amount_raw).replace('$', '').replace(',', '').strip()
-        hours_or_amount_val = float(hours_or_amount_str) if hours_or_amount_str else 0.0
+        if isinstance(hours_or_amount_raw, (int, float)) and not isinstance(hours_or_amount_raw, bool):
+            # Numbers (e.g. from the transformation) need no string cleanup
+            hours_or_amount_val = float(hours_or_amount_raw)
+        else:
+            # Remove currency symbols and commas in one pass, then convert to float
+            hours_or_amount_str = str(hours_or_amount_raw).translate(_CURRENCY_STRIP).strip()
+            hours_or_amount_val = float(hours_or_amount_str) if hours_or_amount_str else 0.0
         if hours_or_amount_val < 0:
             hours_or_amount_valid = False
     except Exception as e:
@@ -96,12 +122,119 @@ def validate_hours_or_amount(row, idx=None):
     return hours_or_amount_valid, hours_or_amount_val
 
 
+def _title(name):
+    """
+    Title-case a name, returning it unchanged (no new string) when it is already title-cased.
+
+    Args:
+        name (str): The name to format.
+
+    Returns:
+        str: The title-cased name, or '' for a missing name.
+    """
+    if not name:
+        return ''
+    return name if name.istitle() else name.title()
+
+
+def _column_values(rows, col):
+    """
+    Return the values of one Output field across all rows.
+
+    Args:
+        rows (list[Output] or pandas.DataFrame): The rows.
+        col (str): The Output field name.
+
+    Returns:
+        list or numpy.ndarray: The values, with missing DataFrame values as None.
+    """
+    if isinstance(rows, pd.DataFrame):
+        if col not in rows.columns:
+            return [''] * len(rows)
+        return rows[col].to_numpy(dtype=object, na_value=None)
+    return [getattr(row, col) for row in rows]
+
+
+def _normalized_names(values):
+    """
+    Lowercase and strip a column of names, with missing or empty names as ''.
+
+    Args:
+        values (list): Raw name values.
+
+    Returns:
+        pandas.Series: Normalized names (object dtype).
+    """
+    series = pd.Series(values, dtype=object)
+    return series.where(series.astype(bool), '').astype(str).str.lower().str.strip()
+
+
+def validate_rows(rows, employees, index=None):
+    """
+    Column-wise equivalent of validate_employee_id and validate_hours_or_amount over all rows.
+
+    IDs, names and hours/amounts are normalized and parsed with vectorized pandas operations;
+    only the final name-match lookups and unparseable hours/amounts (which are re-checked
+    with validate_hours_or_amount so that the results and warnings match exactly) touch
+    Python per row.
+
+    Args:
+        rows (list[Output] or pandas.DataFrame): Rows to validate, as Output objects or as a
+            DataFrame with one column per Output field.
+        employees (list[dict]): List of employee dictionaries.
+        index (EmployeeIndex, optional): Lookup index over employees. Built on the fly if omitted.
+
+    Returns:
+        tuple: (employee_id_valid (list[bool]), possible_ids (list[list]),
+                hours_or_amount_valid (list[bool]), hours_or_amount_val (list[float]))
+    """
+    count = len(rows)
+    if not employees:
+        logging.warning("No employees available for validation - skipping employee ID validation")
+        employee_id_valid = [True] * count
+        possible_ids = [[] for _ in range(count)]
+    else:
+        if index is None:
+            index = EmployeeIndex.from_employees(employees)
+        # Exact ID matches
+        ids = pd.Series(_column_values(rows, 'employee_id'), dtype=object)
+        id_valid = ids.astype(bool) & ids.astype(str).str.strip().isin(index.by_id.keys())
+        employee_id_valid = id_valid.tolist()
+        # Name matches for the rows without a valid ID
+        first = _normalized_names(_column_values(rows, 'first_name'))
+        last = _normalized_names(_column_values(rows, 'last_name'))
+        needs_names = (~id_valid & first.astype(bool) & last.astype(bool)).to_numpy()
+        by_name = index.by_name
+        possible_ids = [
+            list(by_name.get((f, l), [])) if needed else []
+            for needed, f, l in zip(needs_names, first.tolist(), last.tolist())
+        ]
+    
+    # Hours or amount: strip currency symbols and commas, parse, flag negatives
+    raw = pd.Series(_column_values(rows, 'hours_or_amount'), dtype=object)
+    cleaned = raw.astype(str).str.translate(_CURRENCY_STRIP).str.strip()
+    values = pd.to_numeric(cleaned.where(cleaned != '', '0'), errors='coerce').astype('float64')
+    hours_value = values.to_numpy()
+    hours_valid = ~(hours_value < 0)
+    hours_value = hours_value.tolist()
+    hours_valid = hours_valid.tolist()
+    # Values pandas could not parse go through the scalar validator (same rules and warnings)
+    for idx in np.flatnonzero(values.isna().to_numpy()).tolist():
+        hours_valid[idx], hours_value[idx] = validate_hours_or_amount({'hours_or_amount': raw.iat[idx]}, idx)
+    return employee_id_valid, possible_ids, hours_valid, hours_value
+
+
 def validate_transformation(data, employees):
     """
-    Validate a list of transformed payroll data rows against employee data and payroll rules.
+    Validate transformed payroll data rows against employee data and payroll rules.
+
+    Output rows are updated in place with the validation results; dict rows are
+    converted to new Output objects first. A DataFrame (e.g. straight from
+    daxco_transformation_df) is validated column-wise and left unchanged, so no
+    per-row objects are created for it.
 
     Args:
-        data (list[Output]): List of payroll data rows to validate.
+        data (list[Output] or pandas.DataFrame): Payroll data rows to validate.
         employees (list[dict]): List of employee dictionaries.
 
     Returns:
@@ -121,56 +254,64 @@ def validate_transformation(data, employees):
     else:
         logging.warning("No employee data available for validation")
     
-    # First, run our legacy validation to maintain compatibility with existing clients
-    legacy_validation = []
+    # Index employees once instead of scanning the list for every row
+    index = EmployeeIndex.from_employees(employees)
+    
+    # Update the legacy fields (kept for existing clients) and build the new validation
+    # format in a single pass over the rows
+    validation_result = ValidationResult()
     all_valid = True
+    debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
+    
+    columnar = isinstance(data, pd.DataFrame)
+    if columnar:
+        rows = data
+    else:
+        # Convert dicts to Output so that rows can be updated in place
+        rows = [row if isinstance(row, Output) else Output(**row) for row in data]
+    
+    # Validate employee IDs and hours/amounts for all rows at once
+    employee_id_valids, possible_ids_list, hours_valids, hours_values = validate_rows(rows, employees, index)
     
-    for idx, row in enumerate(data):
-        # If row is a dict, convert to Output
-        if not isinstance(row, Output):
-            row = Output(**row)
+    # DataFrame rows are read as lightweight named tuples (same attribute names as Output)
+    for idx, row in enumerate(data.itertuples(index=False) if columnar else rows):
+        employee_id_valid = employee_id_valids[idx]
+        possible_ids = possible_ids_list[idx]
+        hours_or_amount_valid = hours_valids[idx]
         
         # Log row data for debugging
-        logging.debug(f"Validating row {idx}: employee_id={row.employee_id}, first_name={row.first_name}, last_name={row.last_name}")
+        if debug_enabled:
+            logging.debug(f"Validating row {idx}: employee_id={row.employee_id}, first_name={row.first_name}, last_name={row.last_name}")
         
-        # Validate employee ID and hours/amount for each row
-        employee_id_valid, possible_ids = validate_employee_id(row.__dict__, employees)
-        hours_or_amount_valid, hours_or_amount_val = validate_hours_or_amount(row.__dict__, idx)
-        
-        # Update the row with validation results
-        out_row = Output(
-            **{**row.__dict__,
-               'first_name': row.first_name.title() if row.first_name else '',
-               'last_name': row.last_name.title() if row.last_name else '',
-               'employee_id_valid': employee_id_valid,
-               'possible_employee_ids': possible_ids,
-               'hours_or_amount': hours_or_amount_val,
-               'hours_or_amount_valid': hours_or_amount_valid,
-               # Maintain compatibility with old validation fields
-               'employee_code_valid': employee_id_valid,
-               'possible_employee_codes': possible_ids,
-               'scheduled_payroll_valid': True  # Not validating this in new format
-              }
-        )
-        legacy_validation.append(out_row)
+        if not columnar:
+            # Update the row in place with validation results
+            row.first_name = _title(row.first_name)
+            row.last_name = _title(row.last_name)
+            row.employee_id_valid = employee_id_valid
+            row.possible_employee_ids = possible_ids
+            row.hours_or_amount = hours_values[idx]
+            row.hours_or_amount_valid = hours_or_amount_valid
+            # Maintain compatibility with old validation fields
+            row.employee_code_valid = employee_id_valid
+            row.possible_employee_codes = possible_ids
+            row.scheduled_payroll_valid = True  # Not validating this in new format
         if not employee_id_valid or not hours_or_amount_valid:
             logging.warning(f"Row {idx} invalid: employee_id_valid={employee_id_valid}, hours_or_amount_valid={hours_or_amount_valid}")
-            logging.debug(f"Possible employee IDs: {possible_ids}")
+            if debug_enabled:
+                logging.debug(f"Possible employee IDs: {possible_ids}")
             all_valid = False
+        
+        # Reuse the results computed above instead of validating the row again
+        validation_result.rows.append(RowValidation.from_output(
+            row, employees, index,
+            employee_id_valid=employee_id_valid,
+            possible_ids=possible_ids,
+            hours_valid=hours_or_amount_valid,
+            hours_value=hours_values[idx]
+        ))
     
-    # Now create new validation format
-    # all_valid should only be true if ALL rows have valid employee IDs and valid hours/amounts
-    all_rows_valid = all(
-        row.employee_id_valid and row.hours_or_amount_valid
-        for row in legacy_validation
-    )
-    
-    validation_result = ValidationResult(all_valid=all_rows_valid)
-    
-    for row in legacy_validation:
-        row_validation = RowValidation.from_output(row, employees)
-        validation_result.rows.append(row_validation)
-    
-    logging.info(f"Validation complete. All valid: {all_rows_valid}")
+    # all_valid is only true if ALL rows have valid employee IDs and valid hours/amounts
+    validation_result.all_valid = all_valid
+    logging.info(f"Validation complete. All valid: {all_valid}")
     
     return validation_result.to_dict()
\ No newline at end of file
@@ -63,51 +63,55 @@ class RowValidation:
     distributed_dept_code: FieldValidation
     
     def to_dict(self) -> Dict[str, Any]:
-        result = asdict(self)
-        # Convert snake_case field names back to original display names
-        field_mapping = {
-            "gross_to_net_code": "Gross to Net Code",
-            "type_code": "Type Code",
-            "hours_or_amount": "Hours or Amount",
-            "temporary_rate": "Temporary Rate",
-            "distributed_dept_code": "Distributed Dept Code"
+        # Build the result directly with the display names instead of asdict() + renaming
+        return {
+            "Employee": self.Employee.to_dict(),
+            "Gross to Net Code": self.gross_to_net_code.to_dict(),
+            "Type Code": self.type_code.to_dict(),
+            "Hours or Amount": self.hours_or_amount,
+            "Temporary Rate": self.temporary_rate,
+            "Distributed Dept Code": self.distributed_dept_code.to_dict()
         }
-        
-        for key, value in list(result.items()):
-            if isinstance(value, FieldValidation):
-                result[key] = value.to_dict()
-            
-            # Rename fields back to their display names
-            if key in field_mapping:
-                result[field_mapping[key]] = result.pop(key)
-                
-        return result
     
     @classmethod
-    def from_output(cls, output, employees):
+    def from_output(cls, output, employees, index=None, employee_id_valid=None, possible_ids=None,
+                    hours_valid=None, hours_value=None):
         """
         Create a RowValidation instance from an Output instance.
         
+        Results already computed by the caller can be passed in to avoid running
+        the validators a second time; any that are omitted are computed here.
+        
         Args:
             output: An Output instance.
             employees: List of employee dictionaries.
+            index: Optional EmployeeIndex over employees; built on the fly if omitted.
+            employee_id_valid: Optional precomputed employee ID validity.
+            possible_ids: Optional precomputed list of possible employee IDs.
+            hours_valid: Optional precomputed hours/amount validity.
+            hours_value: Optional precomputed parsed hours/amount value.
             
         Returns:
             A RowValidation instance.
         """
-        from .validate_transformation import validate_employee_id, validate_hours_or_amount
+        from .validate_transformation import EmployeeIndex, validate_employee_id, validate_hours_or_amount
+        
+        if index is None:
+            index = EmployeeIndex.from_employees(employees)
+        
+        # Only build the row dict when a validator has to run, and then only once
+        row_dict = None
         
         # Validate employee
-        employee_id_valid, possible_ids = validate_employee_id(output.__dict__, employees)
+        if employee_id_valid is None or possible_ids is None:
+            row_dict = output.to_dict()
+            employee_id_valid, possible_ids = validate_employee_id(row_dict, employees, index)
         
         # Create Employee field validation
         employee_validation = FieldValidation(valid=employee_id_valid)
         if output.employee_id and employee_id_valid:
             # Find the matching employee
-            matching_employee = next(
-                (e for e in employees if str(e['employee_id']) == str(output.employee_id)), 
-                None
-            )
+            matching_employee = index.by_id.get(str(output.employee_id).strip())
             if matching_employee:
                 employee_validation.exact_match = ExactMatch(
                     employee_id=matching_employee['employee_id'],
@@ -117,6 +121,8 @@ class RowValidation:
         
         # Create possible employee matches
         if possible_ids:
+            # Look the candidates up by ID instead of scanning every employee
+            candidates = (index.by_id.get(str(eid).strip()) for eid in possible_ids)
             employee_validation.possible_matches = [
                 EmployeeMatch(
                     employee_id=e['employee_id'],
@@ -124,7 +130,7 @@ class RowValidation:
                     last_name=e['last_name'],
                     home_department=e.get('dept_codes', [''])[0] if e.get('dept_codes') else ''
                 )
-                for e in employees if e['employee_id'] in possible_ids
+                for e in candidates if e is not None
             ]
         
         # Validate gross to net code (always valid in current implementation)
@@ -138,7 +144,10 @@ class RowValidation:
             type_code_validation.exact_match = ExactMatch(net_code=output.type_code)
         
         # Validate hours or amount
-        hours_valid, hours_value = validate_hours_or_amount(output.__dict__)
+        if hours_valid is None or hours_value is None:
+            if row_dict is None:
+                row_dict = output.to_dict()
+            hours_valid, hours_value = validate_hours_or_amount(row_dict)
         
         # Validate distributed dept code (always valid in current implementation)
         dept_code_validation = FieldValidation(valid=True)
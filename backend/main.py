@@ -14,7 +14,7 @@ Configuration:
 - Helper functions for data fetching, transformation, and validation are imported from helper_functions.py.
 
 Security:
-- CORS is enabled for all origins (adjust in production).
+- CORS allows the origins listed in CORS_ORIGINS (all origins if unset; restrict in production).
 - File size and type checks are enforced for uploads.
 
 Error Handling:
@@ -24,20 +24,40 @@ Error Handling:
 """
 import time
 import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, File, UploadFile, Query, HTTPException, Body, status
-from fastapi.responses import JSONResponse, StreamingResponse
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+# orjson is optional; without it large results are encoded with the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import io
 import csv
+import json
+import operator
 import yaml
+import pandas as pd
 import os
+from types import MappingProxyType
+import atexit
+import queue
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from helper_functions import (
-    fetch_employees, daxco_transformation, validate_transformation, OUTPUT_COLUMNS
+    fetch_employees, daxco_transformation, daxco_transformation_df, validate_transformation, OUTPUT_COLUMNS,
+    save_rows, load_rows, purge_expired_rows
 )
 from helper_functions.constants import Output
+from helper_functions.response_cache import (
+    webhook_cache_key, get_cached_webhook_response, cache_webhook_response
+)
+from helper_functions.db_utils import DB_POOL_SIZE, is_db_timeout, is_db_connection_error
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -52,109 +72,335 @@ file_handler = RotatingFileHandler(log_file, maxBytes=10485760, backupCount=5)
 file_format = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 file_handler.setFormatter(file_format)
 
-# Configure root logger
-root_logger = logging.getLogger()
-root_logger.setLevel(logging.INFO)
-root_logger.addHandler(file_handler)
-
 # Add stdout handler for console output
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(file_format)
-root_logger.addHandler(console_handler)
+
+# Configure root logger. Request threads only enqueue records; the file and console
+# handlers (write + flush under a lock) run on the listener's background thread.
+log_queue = queue.SimpleQueue()
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+root_logger.addHandler(QueueHandler(log_queue))
+log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+log_listener.start()
+# Flush the queued records on interpreter exit
+atexit.register(log_listener.stop)
 
 logging.info("Application starting up...")
 
 FUNCTION_REGISTRY = {
     'fetch_employees': fetch_employees,
     'daxco_transformation': daxco_transformation,
+    'daxco_transformation_df': daxco_transformation_df,
     'validate_transformation': validate_transformation,
 }
 
-app = FastAPI()
+if orjson is not None:
+    class FastJSONResponse(JSONResponse):
+        """
+        JSONResponse encoded with orjson, which is several times faster than the stdlib
+        encoder on large row lists. NumPy scalars/arrays are serialized natively.
+        """
+        def render(self, content) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+else:
+    FastJSONResponse = JSONResponse
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for development; restrict in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Seconds between background database probes, and the age after which /health probes itself
+HEALTH_PROBE_INTERVAL = 15
+HEALTH_PROBE_MAX_AGE = 30
 
-def load_integration_config():
-    with open('integration_config.yml', 'r') as f:
-        return yaml.safe_load(f)
+# Health response body around the timestamp; everything else only changes when the probe runs
+_HEALTH_HEAD = b'{"status":"%s","version":"1.0.0","timestamp":'
+_HEALTH_TAIL = b',"database":%s}'
 
-INTEGRATION_CONFIG = load_integration_config()
+def encode_health(database):
+    """
+    Pre-encode the /health body for a probe result, except for the per-request timestamp.
 
-def run_integration_stages(stages, context):
-    for stage in stages:
-        func = FUNCTION_REGISTRY[stage["function"]]
-        args = [context[k] for k in stage["input_stage"]]
-        try:
-            result = func(*args)
-            context[stage["output_stage"]] = result
-        except RuntimeError as e:
-            if "timeout expired" in str(e).lower() or "login timeout" in str(e).lower():
-                logging.error(f"Database connection timeout in stage {stage['name']}: {str(e)}")
-                raise HTTPException(
-                    status_code=503, 
-                    detail="Database connection timed out. The server may be temporarily unavailable. Please try again later."
-                )
-            logging.error(f"Error in stage {stage['name']}: {str(e)}")
-            raise  # Re-raise the exception to stop the pipeline
-        except Exception as e:
-            logging.error(f"Error in stage {stage['name']}: {str(e)}")
-            raise  # Re-raise the exception to stop the pipeline
-    return context
+    Args:
+        database (dict): The database status dict (see probe_database).
 
-@app.get('/health')
-def health_check():
+    Returns:
+        tuple: (head (bytes), tail (bytes)); the body is head + timestamp + tail.
     """
-    Health check endpoint for Docker health checks.
-    Returns a 200 OK response if the API is running.
-    Also attempts a lightweight database connection check.
+    # Overall status depends on database connection
+    healthy = database["status"] in ("connected", "not_configured")
+    return (
+        _HEALTH_HEAD % (b"healthy" if healthy else b"degraded"),
+        _HEALTH_TAIL % json.dumps(database, separators=(",", ":")).encode()
+    )
+
+# (probe time, database status dict, pre-encoded health body); replaced as a whole so
+# readers never see a partial update
+_db_health = (0.0, {"status": "unknown"}, encode_health({"status": "unknown"}))
+
+def probe_database():
     """
-    health_info = {
-        "status": "healthy",
-        "version": "1.0.0",
-        "timestamp": time.time(),
-        "database": {
-            "status": "unknown"
-        }
-    }
-    
-    # Attempt a lightweight database connectivity test
+    Run a lightweight connectivity check (SELECT 1) on a pooled database connection.
+
+    Returns:
+        dict: {'status': 'connected' | 'disconnected' | 'not_configured' | 'error'},
+            plus an 'error' message when the check failed and the connection 'pool' stats
+            once a connection string is available.
+    """
+    database = {"status": "unknown"}
     try:
-        from helper_functions.db_utils import get_connection_string, connect_with_retry
+        from helper_functions.db_utils import get_connection_string, pooled_connection, pool_stats
+        from helper_functions.sql_queries import HEALTH_CHECK_QUERY
         import pyodbc
         
-        # Just test connection without running a query
         connection_string = get_connection_string()
         if connection_string:
             try:
-                conn = connect_with_retry(connection_string)
-                conn.close()
-                health_info["database"]["status"] = "connected"
+                # Reuses an idle pooled connection; a failed probe discards it
+                with pooled_connection() as pooled:
+                    with pooled.conn.cursor() as cursor:
+                        cursor.execute(HEALTH_CHECK_QUERY).fetchone()
+                database["status"] = "connected"
             except Exception as e:
-                health_info["database"]["status"] = "disconnected"
-                health_info["database"]["error"] = str(e)
+                database["status"] = "disconnected"
+                database["error"] = str(e)
+            database["pool"] = pool_stats()
         else:
-            health_info["database"]["status"] = "not_configured"
+            database["status"] = "not_configured"
     except Exception as e:
-        health_info["database"]["status"] = "error"
-        health_info["database"]["error"] = str(e)
+        database["status"] = "error"
+        database["error"] = str(e)
+    return database
+
+def refresh_db_health():
+    """
+    Probe the database and publish the result for /health.
+
+    Returns:
+        tuple: (probe time, database status dict, pre-encoded health body)
+    """
+    global _db_health
+    database = probe_database()
+    _db_health = (time.time(), database, encode_health(database))
+    return _db_health
+
+async def _db_health_heartbeat():
+    # Probe in a worker thread so connection retries never block the event loop
+    while True:
+        try:
+            await run_in_threadpool(refresh_db_health)
+        except Exception as e:
+            logging.error(f"Database health probe failed: {str(e)}")
+        await asyncio.sleep(HEALTH_PROBE_INTERVAL)
+
+# Dedicated workers for the blocking pipeline/validation work, sized to the database pool
+# so that concurrent requests never need more connections than the pool keeps open. Created and
+# drained by lifespan; while it is None (app served without lifespan) run_in_executor falls back
+# to the event loop's default executor.
+PIPELINE_EXECUTOR = None
+
+# Seconds between sweeps of expired /webhook -> /validate row handoff files
+HANDOFF_PURGE_INTERVAL = 600
+
+async def _handoff_purge_loop():
+    while True:
+        try:
+            await run_in_threadpool(purge_expired_rows)
+        except Exception as e:
+            logging.error(f"Purging expired handoff rows failed: {str(e)}")
+        await asyncio.sleep(HANDOFF_PURGE_INTERVAL)
+
+@asynccontextmanager
+async def lifespan(app):
+    global PIPELINE_EXECUTOR
+    executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix='pipeline')
+    PIPELINE_EXECUTOR = executor
+    heartbeat = asyncio.create_task(_db_health_heartbeat())
+    handoff_purge = asyncio.create_task(_handoff_purge_loop())
+    try:
+        yield
+    finally:
+        heartbeat.cancel()
+        handoff_purge.cancel()
+        PIPELINE_EXECUTOR = None
+        # Let running pipelines finish (queued ones are dropped) without blocking the event loop
+        await run_in_threadpool(executor.shutdown, wait=True, cancel_futures=True)
+
+# Endpoints returning plain dicts (e.g. /health) are encoded with orjson too. /webhook and
+# /validate return FastJSONResponse directly, which also skips FastAPI's jsonable_encoder
+# walk over the (large) result.
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+
+# Responses smaller than this are sent uncompressed; level 5 trades little ratio for speed
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 5
+
+# Maximum accepted upload size and the chunk size used to read it
+MAX_UPLOAD_BYTES = 2 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Allowance for the multipart framing (boundaries, part headers) around the uploaded file
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject uploads whose declared Content-Length is too large with 413, before the body is read.
+
+    FastAPI parses (and spools) the whole multipart form before the endpoint runs, so the
+    streaming size check in /webhook alone cannot stop an oversized body from being received.
+    Requests without a Content-Length (chunked) still go through that streaming check.
+    """
+    def __init__(self, app, max_body_bytes, paths):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.paths:
+            content_length = dict(scope["headers"]).get(b"content-length")
+            if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_bytes:
+                logging.error(f"Upload rejected before reading: Content-Length {int(content_length)} bytes")
+                response = JSONResponse(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, content={"detail": "File too large (max 2MB)"})
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+# Added before CORSMiddleware so that CORS wraps it and its 413 carries the CORS headers
+app.add_middleware(UploadSizeLimitMiddleware, max_body_bytes=MAX_UPLOAD_BYTES + UPLOAD_FORM_OVERHEAD, paths=['/webhook'])
+
+# Allowed origins, comma-separated (e.g. https://app.example.com); defaults to all origins for development
+CORS_ORIGINS = [origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin.strip()]
+
+# Only the methods and request headers the API actually uses, so preflights are exact matches
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=CORS_ORIGINS,
+    allow_credentials=True,
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    expose_headers=["Content-Disposition"],
+)
+
+# Compress JSON and CSV responses (repetitive row data shrinks several times) for clients
+# sending Accept-Encoding: gzip; streamed /download responses are compressed chunk by chunk
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE, compresslevel=GZIP_LEVEL)
+
+# Use the LibYAML-backed loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+INTEGRATION_CONFIG_PATH = 'integration_config.yml'
+
+def _freeze(value):
+    """
+    Recursively turn a parsed config into read-only structures (dicts become
+    MappingProxyType views, lists become tuples).
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def load_integration_config():
+    """
+    Load the integration config as a read-only mapping.
+
+    Returns:
+        MappingProxyType: integration_type -> integration_provider -> tuple of stages.
+    """
+    with open(INTEGRATION_CONFIG_PATH, 'rb') as f:
+        return _freeze(yaml.load(f, Loader=YAML_LOADER))
+
+INTEGRATION_CONFIG = load_integration_config()
+
+# Flattened (integration_type, integration_provider) -> stages lookup used by the endpoints
+INTEGRATION_LOOKUP = {
+    (integration_type, integration_provider): stages
+    for integration_type, providers in INTEGRATION_CONFIG.items()
+    for integration_provider, stages in providers.items()
+}
+
+def find_handoff_stage(stages):
+    """
+    Return the output of the stage marked `handoff: true`, whose rows /webhook keeps for
+    /validate when called with handoff=true.
+
+    Args:
+        stages (Sequence[Mapping]): Stage definitions from the integration config.
+
+    Returns:
+        str or None: The handoff stage's output_stage, or None if no stage is marked.
+
+    Raises:
+        ValueError: If more than one stage is marked.
+    """
+    marked = [stage["output_stage"] for stage in stages if stage.get("handoff")]
+    if len(marked) > 1:
+        raise ValueError(f"Only one stage may be marked handoff, got: {marked}")
+    return marked[0] if marked else None
+
+# (integration_type, integration_provider) -> handoff stage output (or None), checked at startup
+HANDOFF_STAGES = {key: find_handoff_stage(stages) for key, stages in INTEGRATION_LOOKUP.items()}
+
+def compile_integration_stages(stages):
+    """
+    Resolve a list of stages into a single callable, once.
+
+    The stage functions, input slots and output slot are looked up here instead of on every
+    request; the returned function only calls the stages in order.
+
+    Args:
+        stages (Sequence[Mapping]): Stage definitions from the integration config.
+
+    Returns:
+        Callable[[dict], dict]: run(context) executing all stages and returning the updated context.
+    """
+    steps = tuple(
+        (stage["name"], FUNCTION_REGISTRY[stage["function"]], tuple(stage["input_stage"]), stage["output_stage"])
+        for stage in stages
+    )
     
-    # Overall status depends on database connection
-    if health_info["database"]["status"] != "connected" and health_info["database"]["status"] != "not_configured":
-        health_info["status"] = "degraded"
+    def run(context):
+        for name, func, input_stage, output_stage in steps:
+            try:
+                context[output_stage] = func(*[context[k] for k in input_stage])
+            except RuntimeError as e:
+                if is_db_timeout(e):
+                    logging.error(f"Database connection timeout in stage {name}: {str(e)}")
+                    raise HTTPException(
+                        status_code=503, 
+                        detail="Database connection timed out. The server may be temporarily unavailable. Please try again later."
+                    )
+                logging.error(f"Error in stage {name}: {str(e)}")
+                raise  # Re-raise the exception to stop the pipeline
+            except Exception as e:
+                logging.error(f"Error in stage {name}: {str(e)}")
+                raise  # Re-raise the exception to stop the pipeline
+        return context
     
-    return health_info
+    return run
+
+# (integration_type, integration_provider) -> compiled pipeline, built once at startup
+COMPILED_PIPELINES = {key: compile_integration_stages(stages) for key, stages in INTEGRATION_LOOKUP.items()}
+
+@app.get('/health')
+def health_check():
+    """
+    Health check endpoint for Docker health checks.
+    Returns a 200 OK response if the API is running.
+    The database status comes from the background probe; if the last probe is older
+    than HEALTH_PROBE_MAX_AGE seconds, a fresh probe is run first.
+    The body was encoded when the probe ran; only the timestamp is spliced in here.
+    """
+    probed_at, database, (head, tail) = _db_health
+    if time.time() - probed_at >= HEALTH_PROBE_MAX_AGE:
+        probed_at, database, (head, tail) = refresh_db_health()
+    # repr() of a float is its JSON representation
+    return Response(content=head + repr(time.time()).encode() + tail, media_type="application/json")
 
 @app.post('/webhook')
-def webhook(
+async def webhook(
     company_id: int = Query(..., alias="companyId"),
     integration_type: str = Query(...),
     integration_provider: str = Query(...),
+    handoff: bool = Query(False),
     file: UploadFile = File(...)
 ):
     """
@@ -162,12 +408,15 @@ def webhook(
     - Validates integration type/provider and file type/size.
     - Runs configured transformation stages.
     - Returns the final output as JSON.
+    - A repeated upload within WEBHOOK_CACHE_TTL is answered from cache.
+    - With handoff=true, the transformed rows are kept server-side and the response
+      includes a 'token' that /validate accepts instead of the rows.
     
     Returns:
         JSONResponse: The transformed data or appropriate error response
         
     Raises:
-        HTTPException: For client errors (400) or server errors (503)
+        HTTPException: For client errors (400), oversized files (413) or server errors (503)
     """
     request_start_time = time.time()
     
@@ -175,36 +424,50 @@ def webhook(
         logging.info(f"Received webhook: company_id={company_id}, integration_type={integration_type}, integration_provider={integration_provider}, filename={file.filename}")
         
         # Check if integration type/provider is supported
-        if integration_type not in INTEGRATION_CONFIG or integration_provider not in INTEGRATION_CONFIG[integration_type]:
+        stages = INTEGRATION_LOOKUP.get((integration_type, integration_provider))
+        if stages is None:
             logging.error(f"Unsupported integration: {integration_type}/{integration_provider}")
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Unsupported integration')
+        if handoff and HANDOFF_STAGES[(integration_type, integration_provider)] is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Row handoff is not supported for this integration')
         
         # Only accept CSV files
         if file.content_type not in ['text/csv', 'application/vnd.ms-excel']:
             logging.error(f"Unsupported file type: {file.content_type}")
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Only CSV files are accepted')
         
-        contents = file.file.read()
+        # Read the upload in chunks and enforce the size limit (2MB) while streaming.
+        # Chunks are appended to one growing buffer, which the pipeline consumes directly
+        # (no final join copy).
+        contents = bytearray()
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            if len(contents) + len(chunk) > MAX_UPLOAD_BYTES:
+                logging.error(f"File too large: more than {MAX_UPLOAD_BYTES} bytes")
+                raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail='File too large (max 2MB)')
+            contents += chunk
         logging.info(f"Read {len(contents)} bytes from uploaded file")
         
-        # Enforce file size limit (2MB)
-        if len(contents) > 2 * 1024 * 1024:
-            logging.error(f"File too large: {len(contents)} bytes")
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='File too large (max 2MB)')
+        # Identical uploads for the same company and integration reuse the previous response
+        cache_key = webhook_cache_key(contents, company_id, integration_type, integration_provider, handoff)
+        body = get_cached_webhook_response(cache_key)
+        if body is not None:
+            logging.info("Webhook response served from cache")
+            return Response(content=body, media_type="application/json")
         
         # Prepare context for integration pipeline
         context = {"file_bytes": contents, "company_id": company_id}
-        stages = INTEGRATION_CONFIG[integration_type][integration_provider]
         logging.debug(f"Integration stages: {stages}")
         
         # Run the integration pipeline
         try:
-            context = run_integration_stages(stages, context)
+            # The pipeline is blocking (CSV parsing, database access), keep it off the event loop
+            pipeline = COMPILED_PIPELINES[(integration_type, integration_provider)]
+            context = await asyncio.get_running_loop().run_in_executor(PIPELINE_EXECUTOR, pipeline, context)
         except HTTPException:
             # Let HTTP exceptions pass through (they're already formatted properly)
             raise
         except RuntimeError as e:
-            if "timeout expired" in str(e).lower() or "login timeout" in str(e).lower() or "connection failed" in str(e).lower():
+            if is_db_connection_error(e):
                 logging.error(f"Database connection error: {str(e)}")
                 raise HTTPException(
                     status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -215,13 +478,29 @@ def webhook(
         
         result = context[stages[-1]["output_stage"]]
         
-        # If result is a list of Output, convert to dicts
-        if isinstance(result, list) and result and isinstance(result[0], Output):
+        # On request, keep the rows of the configured handoff stage (the transformed DataFrame)
+        # server-side, so that /validate can be called with the returned token instead
+        if handoff:
+            handoff_stage = HANDOFF_STAGES[(integration_type, integration_provider)]
+            handoff_rows = context[handoff_stage]
+            if not isinstance(handoff_rows, pd.DataFrame) or not isinstance(result, dict):
+                raise RuntimeError(f"Handoff stage '{handoff_stage}' must produce a DataFrame and the pipeline a dict result")
+            token = await asyncio.get_running_loop().run_in_executor(
+                PIPELINE_EXECUTOR, save_rows, handoff_rows, company_id, integration_type, integration_provider
+            )
+            if token is not None:
+                result["token"] = token
+        
+        # If result is a list of Output, convert to dicts. orjson serializes the (slots)
+        # dataclasses natively, field by field, so the intermediate dicts are skipped with it.
+        if orjson is None and isinstance(result, list) and result and isinstance(result[0], Output):
             result = [r.to_dict() for r in result]
             
         request_duration = time.time() - request_start_time
         logging.info(f"Webhook processing complete in {request_duration:.2f}s, returning {len(result) if isinstance(result, list) else 'non-list'} rows")
-        return JSONResponse(content=result)
+        response = FastJSONResponse(content=result)
+        cache_webhook_response(cache_key, response.body)
+        return response
     except HTTPException as he:
         # Already handled, just re-raise
         raise
@@ -245,10 +524,28 @@ def webhook(
     except Exception as e:
         import traceback
         logging.error(f"Unhandled exception in /webhook: {e}\n{traceback.format_exc()}")
-        return JSONResponse(status_code=500, content={"error": str(e), "trace": traceback.format_exc()})
+        return FastJSONResponse(status_code=500, content={"error": str(e), "trace": traceback.format_exc()})
+
+def run_validation(company_id, input_rows):
+    """
+    Fetch the company's employees and validate the given rows against them (blocking).
+
+    Args:
+        company_id (int): The company whose employees are used for validation.
+        input_rows (list[dict] or pandas.DataFrame): The transformed rows to validate (Output fields).
+
+    Returns:
+        dict: The validation result (see validate_transformation).
+    """
+    employees = fetch_employees(company_id)
+    logging.info(f"Validating {len(input_rows)} rows against {len(employees)} employees")
+    # Validate the dicts column-wise instead of building an Output object per row
+    if isinstance(input_rows, list) and input_rows and isinstance(input_rows[0], dict):
+        input_rows = Output.from_records(input_rows)
+    return validate_transformation(input_rows, employees)
 
 @app.post('/validate')
-def validate(
+async def validate(
     company_id: int = Query(..., alias="companyId"),
     integration_type: str = Query(...),
     integration_provider: str = Query(...),
@@ -256,42 +553,72 @@ def validate(
 ):
     """
     Validates transformed rows against company employee records.
+    - Expects a dict with either a 'rows' key containing a list of dicts, or the 'token'
+      returned by /webhook to validate the rows of that upload without sending them back.
     - Returns validation results as JSON.
     """
-    if integration_type not in INTEGRATION_CONFIG or integration_provider not in INTEGRATION_CONFIG[integration_type]:
+    if (integration_type, integration_provider) not in INTEGRATION_LOOKUP:
         raise HTTPException(status_code=400, detail='Unsupported integration')
     if integration_type != "payroll":
         raise HTTPException(status_code=400, detail='Validation only supported for integration_type=payroll')
     
-    # Fetch employees for validation
-    try:
-        employees = fetch_employees(company_id)
-        logging.info(f"Validating {len(rows['rows'])} rows against {len(employees)} employees")
-        # Convert dicts to Output objects if needed
-        
+    loop = asyncio.get_running_loop()
+    if 'rows' in rows:
         input_rows = rows['rows']
-        if input_rows and isinstance(input_rows[0], dict) and not isinstance(input_rows[0], Output):
-            input_rows = [Output(**r) for r in input_rows]
-        validated = validate_transformation(input_rows, employees)
-        return JSONResponse(content=validated)
+    elif 'token' in rows:
+        # Memory-mapped Arrow file written by /webhook; only usable for the same company and integration
+        input_rows = await loop.run_in_executor(
+            PIPELINE_EXECUTOR, load_rows, rows['token'], company_id, integration_type, integration_provider
+        )
+        if input_rows is None:
+            raise HTTPException(status_code=404, detail='Unknown or expired token')
+    else:
+        raise HTTPException(status_code=400, detail="Request body must contain 'rows' or 'token'")
+    
+    # Fetch employees and validate on the pipeline executor (database access is blocking)
+    try:
+        validated = await loop.run_in_executor(
+            PIPELINE_EXECUTOR, run_validation, company_id, input_rows
+        )
+        return FastJSONResponse(content=validated)
     except Exception as e:
         import traceback
         logging.error(f"Error during validation: {str(e)}\n{traceback.format_exc()}")
-        return JSONResponse(status_code=500, content={"error": str(e), "trace": traceback.format_exc()})
+        return FastJSONResponse(status_code=500, content={"error": str(e), "trace": traceback.format_exc()})
+
+# Size of the text chunks streamed by /download
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Picks the output columns of a row in C; rows missing a column fall back to row.get
+_OUTPUT_ROW_GETTER = operator.itemgetter(*OUTPUT_COLUMNS)
+
+def iter_csv(rows):
+    """
+    Yield rows as CSV text (header first) in chunks of roughly DOWNLOAD_CHUNK_SIZE characters.
+    - Columns follow OUTPUT_COLUMNS; missing values are written as empty fields.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(OUTPUT_COLUMNS)
+    for row in rows:
+        try:
+            writer.writerow(_OUTPUT_ROW_GETTER(row))
+        except KeyError:
+            writer.writerow([row.get(col, '') for col in OUTPUT_COLUMNS])
+        if buffer.tell() >= DOWNLOAD_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
 
 @app.post('/download')
-def download(data: dict):
+async def download(data: dict):
     """
     Returns the provided data as a downloadable CSV file.
     - Expects a dict with a 'rows' key containing a list of dicts.
     - Uses OUTPUT_COLUMNS for CSV header and column order.
+    - The CSV is streamed in chunks instead of being built in memory first.
     """
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=OUTPUT_COLUMNS)
-    writer.writeheader()
-    for row in data['rows']:
-        writer.writerow({col: row.get(col, '') for col in OUTPUT_COLUMNS})
-    output.seek(0)
-    return StreamingResponse(iter([output.getvalue()]), media_type='text/csv', headers={
+    return StreamingResponse(iter_csv(data['rows']), media_type='text/csv', headers={
         'Content-Disposition': 'attachment; filename=output.csv'
     })
\ No newline at end of file